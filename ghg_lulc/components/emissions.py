@@ -4,7 +4,6 @@ from typing import Tuple
 import geopandas as gpd
 import numpy as np
 import pandas as pd
-import pyproj
 import shapely
 from climatoology.base.artifact import Chart2dData, ChartType, RasterInfo
 from climatoology.base.computation import ComputationResources
@@ -14,22 +13,37 @@ from matplotlib.colors import to_hex
 from numpy import ma
 from pydantic_extra_types.color import Color
 from rasterio.features import shapes
-from shapely.ops import transform
 
 from ghg_lulc.components.utils import (
     SQM_TO_HA,
     EMISSION_PER_PIXEL_FACTOR,
     RASTER_NO_DATA_VALUE,
+    get_change_labels,
+    reproject_aoi,
 )
 
 log = logging.getLogger(__name__)
 
+NEUTRAL_COLOR = Color('gray')
+NEUTRAL_RGB = NEUTRAL_COLOR.as_rgb_tuple()
+
 
 class EmissionCalculator:
     def __init__(self, emission_factors: pd.DataFrame, resources: ComputationResources):
         self.emission_factors = emission_factors
+        self.emission_factors_by_change = emission_factors.set_index('change_id')
         self.resources = resources
 
+        self.change_emission_factors = emission_factors[
+            emission_factors['raster_value_before'] != emission_factors['raster_value_after']
+        ]
+        self.change_colormap = {
+            change_id: Color(change_color).as_rgb_tuple()
+            for change_id, change_color in zip(
+                self.change_emission_factors['change_id'].tolist(), self.change_emission_factors['change_color']
+            )
+        }
+
     def derive_lulc_changes(
         self,
         lulc_before: RasterInfo,
@@ -68,37 +82,43 @@ class EmissionCalculator:
         :param no_change_value: Integer to indicate no change pixels
         :return: a raster with LULC changes between first and second time stamp
         """
-        changes = np.full_like(lulc_before.data, fill_value=unknown_change_value, dtype=np.uint8)
-
-        emission_factors_only_change_rows = self.emission_factors[
-            self.emission_factors['raster_value_before'] != self.emission_factors['raster_value_after']
-        ]
-
-        for row in emission_factors_only_change_rows.itertuples():
-            changes[(lulc_before.data == row.raster_value_before) & (lulc_after.data == row.raster_value_after)] = (
-                row.change_id
+        before = ma.getdata(lulc_before.data)
+        after = ma.getdata(lulc_after.data)
+        n_values = (
+            max(
+                int(before.max(initial=0)),
+                int(after.max(initial=0)),
+                int(self.emission_factors['raster_value_before'].max()),
+                int(self.emission_factors['raster_value_after'].max()),
             )
-
-        changes[np.logical_and(lulc_before.data == lulc_after.data, lulc_before.data != no_change_value)] = (
-            no_change_value
+            + 1
         )
 
-        change_classes = np.unique(ma.compressed(changes))
-        unknown_index = np.argwhere(change_classes == unknown_change_value)
-        change_classes = np.delete(change_classes, unknown_index)
-
-        change_id_color_map = emission_factors_only_change_rows.set_index('change_id')['change_color'].to_dict()
-
-        changes_colormap = {}
+        change_lookup = np.full((n_values, n_values), fill_value=unknown_change_value, dtype=np.uint8)
+        change_lookup[
+            self.change_emission_factors['raster_value_before'].to_numpy(),
+            self.change_emission_factors['raster_value_after'].to_numpy(),
+        ] = self.change_emission_factors['change_id'].to_numpy()
+        unchanged_values = np.arange(n_values)
+        unchanged_values = unchanged_values[unchanged_values != no_change_value]
+        change_lookup[unchanged_values, unchanged_values] = no_change_value
+
+        changes = ma.masked_array(
+            change_lookup[before, after], mask=ma.getmaskarray(lulc_before.data).copy(), fill_value=unknown_change_value
+        )
 
-        # using dictionary
-        for change_id in change_classes:
-            cid = int(change_id)
-            change_color = change_id_color_map.get(cid)
-            if change_color:
-                changes_colormap[cid] = Color(change_color).as_rgb_tuple()
+        present_classes = np.zeros(np.iinfo(np.uint8).max + 1, dtype=bool)
+        present_classes[ma.compressed(changes)] = True
+        present_classes[unknown_change_value] = False
+        change_classes = np.flatnonzero(present_classes)
 
-            changes_colormap[no_change_value] = Color('gray').as_rgb_tuple()
+        changes_colormap = {
+            change_id: self.change_colormap[change_id]
+            for change_id in change_classes.tolist()
+            if change_id in self.change_colormap
+        }
+        if change_classes.size > 0:
+            changes_colormap[no_change_value] = NEUTRAL_RGB
 
         return RasterInfo(
             data=changes,
@@ -114,19 +134,25 @@ class EmissionCalculator:
         This will return a RasterInfo object with all information necessary to create a geotiff artifact showing
         pixel-wise LULC change emissions (including color map).
 
-        :param changes: a raster with LULC changes between first and second time stamp
+        :param changes: a uint8 raster with LULC changes between first and second time stamp
         :param unknown_emissions_value: a float value to indicate pixels with unknown emissions
         :return: a raster with pixel-wise emissions between first and second time stamp
         """
-        change_emissions = np.full_like(changes.data, fill_value=unknown_emissions_value, dtype=np.float64)
+        change_ids = ma.getdata(changes.data).astype(np.uint8, casting='safe', copy=False)
 
-        emissions_colormap = {}
-        for row in self.emission_factors.itertuples():
-            pixel_emissions = row.emission_factor * EMISSION_PER_PIXEL_FACTOR
+        emission_lookup = np.full(np.iinfo(np.uint8).max + 1, fill_value=unknown_emissions_value, dtype=np.float32)
 
-            change_emissions[changes.data == row.change_id] = pixel_emissions
-            emissions_colormap[pixel_emissions] = row.color.as_rgb_tuple()
-        change_emissions[changes.data == 0] = 0
+        pixel_emissions = (self.emission_factors['emission_factor'].to_numpy() * EMISSION_PER_PIXEL_FACTOR).astype(
+            np.float32
+        )
+        emission_lookup[self.emission_factors['change_id'].to_numpy()] = pixel_emissions
+        emission_lookup[0] = 0
+
+        emissions_colormap = dict(
+            zip(pixel_emissions.tolist(), [color.as_rgb_tuple() for color in self.emission_factors['color']])
+        )
+
+        change_emissions = ma.masked_array(emission_lookup[change_ids], mask=ma.getmaskarray(changes.data).copy())
 
         return RasterInfo(
             data=change_emissions,
@@ -148,18 +174,35 @@ class EmissionCalculator:
             f'{change_raster.data.dtype} to vector'
         )
 
-        results = (
-            {'properties': {'change_id': int(value)}, 'geometry': geometry}
-            for geometry, value in shapes(change_raster.data, mask=None, transform=change_raster.transformation)
-        )
-        org_df = gpd.GeoDataFrame.from_features(results, crs=change_raster.crs)
-
-        org_df = org_df.dissolve(by='change_id', as_index=False)
-        org_df = pd.merge(left=org_df, right=self.emission_factors, on='change_id')
-
-        if org_df.empty:
+        change_mask = np.isin(ma.getdata(change_raster.data), self.emission_factors['change_id'].to_numpy())
+        change_mask &= ~ma.getmaskarray(change_raster.data)
+        if not change_mask.any():
             raise ClimatoologyUserError('No land use/land cover changes were detected between the two selected dates')
 
+        ring_coords = []
+        ring_polygons = []
+        polygon_changes = []
+        for geometry, value in shapes(change_raster.data, mask=change_mask, transform=change_raster.transformation):
+            for ring in geometry['coordinates']:
+                ring_coords.append(np.asarray(ring, dtype=np.float64))
+                ring_polygons.append(len(polygon_changes))
+            polygon_changes.append(int(value))
+
+        coord_rings = np.repeat(np.arange(len(ring_coords)), [len(ring) for ring in ring_coords])
+        rings = shapely.linearrings(np.concatenate(ring_coords), indices=coord_rings)
+        # the first ring of each region is its shell, any further rings are holes
+        polygons = shapely.polygons(rings, indices=ring_polygons)
+
+        # the regions of one change type are disjoint by construction, so they are collected instead of dissolved
+        change_ids, polygon_groups = np.unique(polygon_changes, return_inverse=True)
+        order = np.argsort(polygon_groups, kind='stable')
+        org_df = gpd.GeoDataFrame(
+            {'change_id': change_ids},
+            geometry=shapely.multipolygons(polygons[order], indices=polygon_groups[order]),
+            crs=change_raster.crs,
+        )
+        org_df = org_df.join(self.emission_factors_by_change, on='change_id')
+
         target_utm = org_df.estimate_utm_crs()
         log.debug(f'Reprojecting geodataframe from {change_raster.crs} to {target_utm.name}')
         emission_factor_df = org_df.to_crs(target_utm)
@@ -188,7 +231,6 @@ class EmissionCalculator:
         :return: dataframe with statistics about emissions in the analysis period
         :return: dataframe with statistics about change areas in the analysis period
         """
-        emissions_df = emissions_df.copy()
         subset_pos = emissions_df[emissions_df['emissions'] > 0]
         subset_neg = emissions_df[emissions_df['emissions'] < 0]
         emission_info = self.emission_summary(emissions_df, subset_pos, subset_neg)
@@ -233,21 +275,23 @@ class EmissionCalculator:
         :param aoi: multipolygon of the area of interest
         :return: dataframe with statistics about change areas in the analysis period
         """
-        total_emission_change_area = round(subset_pos.area.sum() * SQM_TO_HA, 2)
-        total_sink_change_area = round(subset_neg.area.sum() * SQM_TO_HA, 2)
+        emission_change_area = subset_pos.area.sum()
+        sink_change_area = subset_neg.area.sum()
+        change_area = emissions_df.area.sum()
+
+        utm_aoi_area = reproject_aoi(aoi, target_crs=emissions_df.crs).area
 
-        wgs84 = pyproj.CRS('EPSG:4326')
-        project = pyproj.Transformer.from_crs(wgs84, emissions_df.crs, always_xy=True).transform
-        utm_aoi = transform(project, aoi)
+        total_emission_change_area = round(emission_change_area * SQM_TO_HA, 2)
+        total_sink_change_area = round(sink_change_area * SQM_TO_HA, 2)
 
-        emitting_change_area_percent = round(subset_pos.area.sum() / utm_aoi.area * 100, 2)
-        sink_change_area_percent = round(subset_neg.area.sum() / utm_aoi.area * 100, 2)
+        emitting_change_area_percent = round(emission_change_area / utm_aoi_area * 100, 2)
+        sink_change_area_percent = round(sink_change_area / utm_aoi_area * 100, 2)
 
-        aoi_area = round(utm_aoi.area * SQM_TO_HA, 2)
-        relative_aoi_area = round(utm_aoi.area / utm_aoi.area * 100, 2)
+        aoi_area = round(utm_aoi_area * SQM_TO_HA, 2)
+        relative_aoi_area = round(utm_aoi_area / utm_aoi_area * 100, 2)
 
-        total_change_area = round(emissions_df.area.sum() * SQM_TO_HA, 2)
-        relative_change_area = round(emissions_df.area.sum() / utm_aoi.area * 100, 2)
+        total_change_area = round(change_area * SQM_TO_HA, 2)
+        relative_change_area = round(change_area / utm_aoi_area * 100, 2)
         data_area_info = [
             ['Area of Interest (AOI)', aoi_area, relative_aoi_area],
             ['Change Area', total_change_area, relative_change_area],
@@ -268,19 +312,19 @@ class EmissionCalculator:
         and emissions [t] per change type
         :return: dataframe with total LULC change area [ha] and total LULC change emissions [t] per change type
         """
-        change_type_df = emissions_df.copy()
-
-        change_type_df['Change'] = change_type_df.apply(
-            lambda row: f'{row.utility_class_name_before} to {row.utility_class_name_after}', axis=1
+        change_type_df = pd.DataFrame(
+            {
+                'Change': get_change_labels(emissions_df),
+                'Area (ha)': round(emissions_df.area * SQM_TO_HA, 2),
+                'Total carbon flows (tonnes)': round(emissions_df['emissions'], 2),
+            }
         )
-        change_type_df['Area (ha)'] = round(change_type_df.area * SQM_TO_HA, 2)
-        change_type_df['Total carbon flows (tonnes)'] = round(change_type_df.emissions, 2)
 
         change_type_df = change_type_df.set_index('Change')
 
         change_type_df = change_type_df.sort_values('Total carbon flows (tonnes)')
 
-        return change_type_df[['Area (ha)', 'Total carbon flows (tonnes)']]
+        return change_type_df
 
     def area_plot(self, emissions_df: gpd.GeoDataFrame) -> Chart2dData:
         """
@@ -292,9 +336,7 @@ class EmissionCalculator:
         emissions_df = emissions_df.sort_values(by='emission_factor').reset_index()
 
         areas = emissions_df.area * SQM_TO_HA
-        labels = emissions_df.apply(
-            lambda row: f'{row.utility_class_name_before} to {row.utility_class_name_after}', axis=1
-        )
+        labels = get_change_labels(emissions_df)
 
         area_chart_data = self.get_area_chart2ddata(areas, labels, emissions_df)
 
@@ -312,31 +354,19 @@ class EmissionCalculator:
         :param emissions_df: geodataframe with LULC change polygons and emissions [t] for each change type
         :return: Chart2dData object for pie chart showing change areas by LULC change type
         """
-        emission_values = emissions_df['emission_factor']
-        n_positives = (emission_values > 0).sum()
-        n_negatives = (emission_values < 0).sum()
+        emission_values = emissions_df['emission_factor'].to_numpy()
+        positives = emission_values > 0
+        negatives = emission_values < 0
+        n_positives = positives.sum()
+        n_negatives = negatives.sum()
 
         cmap_pos = plt.get_cmap('Reds')
         cmap_neg = plt.get_cmap('Blues_r')
 
-        pos_colors = [cmap_pos(i / max(n_positives, 1)) for i in range(n_positives)]
-        neg_colors = [cmap_neg(i / max(n_negatives, 1)) for i in range(n_negatives)]
+        colors = np.full(emission_values.size, '#808080', dtype=object)
+        colors[positives] = [to_hex(c) for c in cmap_pos(np.arange(n_positives) / max(n_positives, 1))]
+        colors[negatives] = [to_hex(c) for c in cmap_neg(np.arange(n_negatives) / max(n_negatives, 1))]
 
-        colors = []
-        pos_counter = 0
-        neg_counter = 0
-
-        for e in emission_values:
-            if e > 0:
-                colors.append(pos_colors[pos_counter])
-                pos_counter += 1
-            elif e < 0:
-                colors.append(neg_colors[neg_counter])
-                neg_counter += 1
-            else:
-                colors.append('#808080')
-
-        colors = [to_hex(c) if not isinstance(c, str) else c for c in colors]
         sort_emission = pd.DataFrame({'x': labels, 'y': sizes, 'colors': colors})
         sort_emission = sort_emission.sort_values(by='y', ascending=False)
 
@@ -359,10 +389,7 @@ class EmissionCalculator:
         emissions_df = emissions_df.sort_values(by='emissions')
 
         emissions = emissions_df['emissions']
-        labels = emissions_df.apply(
-            lambda row: f'{row.utility_class_name_before} to {row.utility_class_name_after}',
-            axis=1,
-        )
+        labels = get_change_labels(emissions_df)
 
         emission_chart_data = self.get_emission_chart2ddata(emissions, labels)
 
@@ -378,7 +405,7 @@ class EmissionCalculator:
         emission_chart_data = Chart2dData(
             x=labels.to_list(),
             y=emissions.to_list(),
-            color=emissions.size * [Color('gray')],
+            color=emissions.size * [NEUTRAL_COLOR],
             chart_type=ChartType.BAR,
         )
         return emission_chart_data
@@ -392,7 +419,6 @@ class EmissionCalculator:
         description, OSM filter, raster value, and color
         :return: dataframe with class name and description (from utility) and GHG stock value
         """
-        ghg_stock = ghg_stock.copy()
         ghg_stock = ghg_stock.sort_values('ghg_stock')
         ghg_stock = ghg_stock[['utility_class_name', 'description', 'ghg_stock']]
         ghg_stock = ghg_stock.rename(
@@ -1,5 +1,6 @@
+from functools import lru_cache
 from numbers import Number
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
@@ -8,14 +9,22 @@ from climatoology.base.artifact_creators import create_raster_artifact
 from climatoology.base.computation import ComputationResources
 from climatoology.utility.lulc import LabelDescriptor
 from pydantic_extra_types.color import Color
+from tabulate import tabulate
 
 from ghg_lulc.components.utils import (
-    PROJECT_DIR,
     RASTER_NO_DATA_VALUE,
     EMISSION_PER_PIXEL_FACTOR,
     Topics,
+    get_change_labels,
+    read_artifact_description,
 )
 
+MAX_LOOKUP_TABLE_SIZE = 4096
+
+UNKNOWN_CLASS_COLOR = Color('gray')
+UNKNOWN_CLASS_RGB = UNKNOWN_CLASS_COLOR.as_rgb_tuple()
+UNKNOWN_VALUE_RGB = Color('black').as_rgb_tuple()
+
 
 def create_classification_artifacts(
     lulc_before: RasterInfo,
@@ -24,38 +33,33 @@ def create_classification_artifacts(
     resources: ComputationResources,
 ) -> Tuple[Artifact, Artifact]:
     # Hack due to https://gitlab.gistools.geog.uni-heidelberg.de/climate-action/web-app/-/issues/114
-    unknown_color = Color('gray')
-    lulc_before.colormap[0] = unknown_color.as_rgb_tuple()
-    lulc_after.colormap[0] = unknown_color.as_rgb_tuple()
-    legend = {v.name: Color(v.color) for _, v in labels.items()}
-    legend['unknown'] = unknown_color
+    lulc_before.colormap[0] = UNKNOWN_CLASS_RGB
+    lulc_after.colormap[0] = UNKNOWN_CLASS_RGB
+    legend = {v.name: legend_color(v.color) for _, v in labels.items()}
+    legend['unknown'] = UNKNOWN_CLASS_COLOR
+    description = read_artifact_description('02_LULC_classifications.md')
 
     lulc_before_metadata = ArtifactMetadata(
         name='Classification for period start',
         filename='lulc_classification_before',
         summary='LULC classification at the start of the analysis period.',
-        description=(PROJECT_DIR / 'resources/artifact_descriptions/02_LULC_classifications.md').read_text(
-            encoding='utf-8'
-        ),
+        description=description,
         tags={Topics.MAPS},
     )
-    lulc_before_artifact = create_raster_artifact(
-        raster_info=lulc_before,
-        legend=Legend(legend_data=legend),
-        metadata=lulc_before_metadata,
-        resources=resources,
-    )
-
     lulc_after_metadata = ArtifactMetadata(
         name='Classification for period end',
         filename='lulc_classification_after',
         summary='LULC classification at the end of the analysis period.',
-        description=(PROJECT_DIR / 'resources/artifact_descriptions/02_LULC_classifications.md').read_text(
-            encoding='utf-8'
-        ),
+        description=description,
         tags={Topics.MAPS},
     )
 
+    lulc_before_artifact = create_raster_artifact(
+        raster_info=lulc_before,
+        legend=Legend(legend_data=legend),
+        metadata=lulc_before_metadata,
+        resources=resources,
+    )
     lulc_after_artifact = create_raster_artifact(
         raster_info=lulc_after,
         legend=Legend(legend_data=legend),
@@ -72,55 +76,59 @@ def create_change_artifacts(
     emission_factors: pd.DataFrame,
     resources: ComputationResources,
 ) -> Tuple[Artifact, Artifact]:
-    masked_change_data = np.ma.masked_equal(change.data, RASTER_NO_DATA_VALUE)
-    masked_change_data = masked_change_data.astype(np.uint8)
+    masked_change_data = mask_no_data(change.data).astype(np.uint8, copy=False)
     masked_change = RasterInfo(
         data=masked_change_data,
         crs=change.crs,
         transformation=change.transformation,
         colormap=change.colormap,
     )
-    emission_factors['change'] = emission_factors.apply(
-        lambda row: f'{row.utility_class_name_before} to {row.utility_class_name_after}', axis=1
-    )
-    lookup = emission_factors.set_index('change_id')['change'].to_dict()
+    lookup = dict(zip(emission_factors['change_id'].tolist(), get_change_labels(emission_factors).tolist()))
     lookup[0] = 'No Change'
 
     change_metadata = ArtifactMetadata(
         name='LULC Change',
         filename='LULC_change',
         summary='LULC changes within the analysis period.',
-        description=(PROJECT_DIR / 'resources/artifact_descriptions/03_LULC_change.md').read_text(encoding='utf-8'),
+        description=read_artifact_description('03_LULC_change.md'),
         tags={Topics.MAPS},
     )
     change_artifact = create_raster_artifact(
         raster_info=masked_change,
         resources=resources,
-        legend=Legend(legend_data={lookup[change_id]: Color(color) for change_id, color in change.colormap.items()}),
+        legend=Legend(
+            legend_data={lookup[change_id]: legend_color(color) for change_id, color in change.colormap.items()}
+        ),
         metadata=change_metadata,
     )
-
-    masked_change_emissions_data = np.ma.masked_equal(change_emissions.data, RASTER_NO_DATA_VALUE)
-    change_emission_description = (PROJECT_DIR / 'resources/artifact_descriptions/04_Localized_emissions.md').read_text(
-        encoding='utf-8'
+    patched_localised_emission_artifact = create_localised_emission_artifact(
+        change, change_emissions, ghg_stock, emission_factors, resources
     )
-    change_emission_description = change_emission_description.format(
-        carbon_stocks=ghg_stock[['utility_class_name', 'ghg_stock']].to_markdown(
-            index=False,
-            headers=['LULC Class', 'Carbon stock (tonnes/ha)'],
-            floatfmt='#.1f',
-        ),
-        emission_factors=emission_factors[
-            ['utility_class_name_before', 'utility_class_name_after', 'emission_factor']
-        ].to_markdown(
-            index=False,
-            headers=['From Class', 'To Class', 'Factor (tonnes/ha)'],
-            floatfmt='#.1f',
+
+    return change_artifact, patched_localised_emission_artifact
+
+
+def create_localised_emission_artifact(
+    change: RasterInfo,
+    change_emissions: RasterInfo,
+    ghg_stock: pd.DataFrame,
+    emission_factors: pd.DataFrame,
+    resources: ComputationResources,
+) -> Artifact:
+    masked_change_emissions_data = mask_no_data(change_emissions.data)
+    change_emission_description = render_emission_description(
+        carbon_stocks=tuple(zip(ghg_stock['utility_class_name'].tolist(), ghg_stock['ghg_stock'].tolist())),
+        emission_factors=tuple(
+            zip(
+                emission_factors['utility_class_name_before'].tolist(),
+                emission_factors['utility_class_name_after'].tolist(),
+                emission_factors['emission_factor'].tolist(),
+            )
         ),
     )
 
     patched_change_emissions_data, patched_emissions_colormap = patch_change_data(
-        masked_change_emissions_data, change_emissions.colormap
+        masked_change_emissions_data, change_emissions.colormap, class_data=change.data
     )
 
     patched_change_emissions = RasterInfo(
@@ -140,6 +148,7 @@ def create_change_artifacts(
         description=change_emission_description,
         tags={Topics.MAPS},
     )
+    pixel_emission_factors = emission_factors['emission_factor'].to_numpy() * EMISSION_PER_PIXEL_FACTOR
     patched_localised_emission_artifact = create_raster_artifact(
         raster_info=patched_change_emissions,
         resources=resources,
@@ -147,25 +156,170 @@ def create_change_artifacts(
             legend_data=ContinuousLegendData(
                 cmap_name='coolwarm',
                 ticks={
-                    str(min(emission_factors.emission_factor) * EMISSION_PER_PIXEL_FACTOR): 0,
-                    str(0): 0.5,
-                    str(max(emission_factors.emission_factor) * EMISSION_PER_PIXEL_FACTOR): 1,
+                    str(pixel_emission_factors.min()): 0,
+                    '0': 0.5,
+                    str(pixel_emission_factors.max()): 1,
                 },
             ),
         ),
         metadata=patched_localised_emission_metadata,
     )
+    return patched_localised_emission_artifact
+
+
+@lru_cache(maxsize=1024)
+def legend_color(color: Union[Tuple[int, ...], str]) -> Color:
+    """
+    Parse a legend color.
+
+    :param color: RGB(A) tuple or color string
+    :return: the parsed color
+    """
+    return Color(color)
+
+
+@lru_cache
+def render_emission_description(
+    carbon_stocks: Tuple[Tuple[str, float], ...],
+    emission_factors: Tuple[Tuple[str, str, float], ...],
+) -> str:
+    """
+    Render the description of the localised carbon flows artifact.
+
+    :param carbon_stocks: rows of LULC class name and carbon stock [t/ha]
+    :param emission_factors: rows of LULC class name before, LULC class name after and emission factor [t/ha]
+    :return: the description as markdown
+    """
+    description = read_artifact_description('04_Localized_emissions.md')
+    return description.format(
+        carbon_stocks=tabulate(
+            carbon_stocks,
+            headers=['LULC Class', 'Carbon stock (tonnes/ha)'],
+            tablefmt='pipe',
+            floatfmt='#.1f',
+        ),
+        emission_factors=tabulate(
+            emission_factors,
+            headers=['From Class', 'To Class', 'Factor (tonnes/ha)'],
+            tablefmt='pipe',
+            floatfmt='#.1f',
+        ),
+    )
 
-    return change_artifact, patched_localised_emission_artifact
 
+def mask_no_data(data: np.ma.MaskedArray, no_data_value: Number = RASTER_NO_DATA_VALUE) -> np.ma.MaskedArray:
+    """
+    Additionally mask all pixels of a raster that equal the no data value.
 
-def patch_change_data(change_data: np.ma.MaskedArray, orig_colormap: Dict[Number, Tuple[int, int, int]]):
-    patched_data = change_data.copy()
-    patched_colormap = {}
-    for key, value in enumerate(np.unique(change_data.compressed())):
-        patched_data[change_data == value] = key
-        patched_colormap[key] = orig_colormap.get(value, Color('black').as_rgb_tuple())
+    In contrast to `np.ma.masked_equal`, the data buffer is shared with the input instead of being copied.
 
-    patched_data = np.ma.MaskedArray(patched_data, mask=change_data.mask)
-    patched_data = patched_data.astype(np.uint8, copy=False)
+    :param data: raster to mask
+    :param no_data_value: value indicating pixels without data
+    :return: view on the raster with the combined mask and the no data value as fill value
+    """
+    raw_data = np.ma.getdata(data)
+    mask = raw_data == no_data_value
+    if np.ma.getmask(data) is not np.ma.nomask:
+        mask |= np.ma.getmask(data)
+    return np.ma.MaskedArray(raw_data, mask=mask, fill_value=no_data_value)
+
+
+def patch_change_data(
+    change_data: np.ma.MaskedArray,
+    orig_colormap: Dict[Number, Tuple[int, int, int]],
+    class_data: Optional[np.ndarray] = None,
+) -> Tuple[np.ma.MaskedArray, Dict[int, Tuple[int, int, int]]]:
+    """
+    Replace the values of a raster by dense integer codes and adapt the colormap accordingly.
+
+    :param change_data: raster to patch
+    :param orig_colormap: colormap of the raster values
+    :param class_data: optional integer raster on the same grid from which the values of `change_data` are derived (one
+    value per class, e.g. the LULC change raster for the emission raster). If given, the codes are derived from the
+    classes, which avoids sorting the raster values.
+    :return: the patched raster and its colormap, the fill value is the largest value of the raster dtype, which is
+    never used as a code
+    """
+    mask = np.ma.getmaskarray(change_data)
+    valid = ~mask
+    valid_values = np.ma.getdata(change_data)[valid]
+    if class_data is None:
+        values, codes = dense_codes(valid_values)
+        if is_dense(values) and change_data.dtype == code_dtype(values.size):
+            # the raster already consists of dense codes
+            patched_data = np.ma.getdata(change_data)
+        else:
+            patched_data = np.zeros(change_data.shape, dtype=code_dtype(values.size))
+            patched_data[valid] = codes
+    else:
+        raw_classes = np.ma.getdata(class_data)
+        classes, class_codes = dense_codes(raw_classes[valid])
+        class_values = np.empty(classes.size, dtype=change_data.dtype)
+        class_values[class_codes] = valid_values
+        values, value_codes = np.unique(class_values, return_inverse=True)
+        if raw_classes.dtype in (np.uint8, np.uint16):
+            # a table covering the whole value range remaps all pixels, masked or not, in a single gather
+            lookup_table = np.zeros(np.iinfo(raw_classes.dtype).max + 1, dtype=code_dtype(values.size))
+            lookup_table[classes] = value_codes
+            patched_data = lookup_table[raw_classes]
+        else:
+            patched_data = np.zeros(change_data.shape, dtype=code_dtype(values.size))
+            patched_data[valid] = value_codes[class_codes]
+
+    patched_colormap = {key: orig_colormap.get(value, UNKNOWN_VALUE_RGB) for key, value in enumerate(values.tolist())}
+
+    patched_data = np.ma.MaskedArray(patched_data, mask=mask, fill_value=np.iinfo(patched_data.dtype).max)
     return patched_data, patched_colormap
+
+
+def is_dense(distinct_values: np.ndarray) -> bool:
+    """
+    :param distinct_values: sorted distinct values
+    :return: whether the values are exactly the dense codes 0..K-1
+    """
+    return (
+        distinct_values.dtype.kind in 'iu'
+        and distinct_values.size > 0
+        and distinct_values[0] == 0
+        and distinct_values[-1] == distinct_values.size - 1
+    )
+
+
+def code_dtype(n_codes: int) -> np.dtype:
+    """
+    :param n_codes: number of distinct codes
+    :return: the smallest unsigned integer type that can hold the codes 0..n_codes-1 and keeps its largest value free as
+    no data value
+    """
+    if n_codes > np.iinfo(np.uint16).max:
+        raise ValueError(
+            f'A paletted raster can hold at most {np.iinfo(np.uint16).max} distinct values besides its no data value, '
+            f'got {n_codes}'
+        )
+    return np.dtype(np.uint8) if n_codes <= np.iinfo(np.uint8).max else np.dtype(np.uint16)
+
+
+def dense_codes(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Enumerate the distinct values of an array and map each element to the position of its value in that enumeration.
+
+    Small non-negative integer values (e.g. class codes) are remapped with a single lookup table gather, everything
+    else falls back to sorting via `np.unique`.
+
+    :param values: one-dimensional array of raster values
+    :return: the sorted distinct values and the dense code (0..K-1) of each element
+    """
+    if values.dtype.kind in 'iu' and values.size > 0:
+        low, high = int(values.min()), int(values.max())
+        if low >= 0 and high < MAX_LOOKUP_TABLE_SIZE:
+            present = np.zeros(high + 1, dtype=bool)
+            present[values] = True
+            distinct_values = np.flatnonzero(present)
+            if is_dense(distinct_values):
+                return distinct_values.astype(values.dtype), values
+
+            lookup_table = np.zeros(high + 1, dtype=np.uint16)
+            lookup_table[distinct_values] = np.arange(distinct_values.size, dtype=np.uint16)
+            return distinct_values.astype(values.dtype), lookup_table[values]
+
+    return np.unique(values, return_inverse=True)
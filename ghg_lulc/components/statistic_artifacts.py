@@ -6,7 +6,7 @@ from climatoology.base.artifact_creators import create_chart_artifact, create_ta
 from climatoology.base.computation import ComputationResources
 
 from ghg_lulc.components.emissions import EmissionCalculator
-from ghg_lulc.components.utils import PROJECT_DIR, Topics, GhgStockSource
+from ghg_lulc.components.utils import Topics, GhgStockSource, read_artifact_description
 from ghg_lulc.core.input import ComputeInput
 
 
@@ -68,7 +68,7 @@ def create_summary_artifact(summary_df: pd.DataFrame, resources: ComputationReso
         name='Summary of results',
         filename='summary',
         summary='Gross emissions, gross sinks, and net emissions/sinks in the analysis period.',
-        description=(PROJECT_DIR / 'resources/artifact_descriptions/10a_summary.md').read_text(encoding='utf-8'),
+        description=read_artifact_description('10a_summary.md'),
         tags={Topics.TABLES},
     )
     summary_artifact = create_table_artifact(
@@ -85,7 +85,7 @@ def create_area_info_artifact(area_info_df: pd.DataFrame, resources: Computation
         filename='area_info',
         summary='Size of the area classified as a carbon source, carbon sink, and total LULC change during the period '
         'of analysis.',
-        description=(PROJECT_DIR / 'resources/artifact_descriptions/10b_area_info.md').read_text(encoding='utf-8'),
+        description=read_artifact_description('10b_area_info.md'),
         tags={Topics.TABLES},
     )
     summary_artifact = create_table_artifact(
@@ -103,7 +103,7 @@ def create_stock_artifact(
         name='Carbon stock values per class',
         filename='stock',
         summary=f'Carbon stock values for each class according to: {stock_source.value}',
-        description=(PROJECT_DIR / 'resources/artifact_descriptions/08_ghg_stocks.md').read_text(encoding='utf-8'),
+        description=read_artifact_description('08_ghg_stocks.md'),
         tags={Topics.TABLES},
     )
     stock_artifact = create_table_artifact(
@@ -120,9 +120,7 @@ def create_change_type_artifact(change_type_table: pd.DataFrame, resources: Comp
         filename='stats_change_type',
         summary='Total change area by LULC change type (ha) and total carbon flows by '
         'LULC change type (tonnes) in the analysis period.',
-        description=(PROJECT_DIR / 'resources/artifact_descriptions/09_stats_change_type.md').read_text(
-            encoding='utf-8'
-        ),
+        description=read_artifact_description('09_stats_change_type.md'),
         tags={Topics.TABLES},
     )
     change_type_table_artifact = create_table_artifact(
@@ -138,7 +136,7 @@ def create_area_plot_artifact(area_data: Chart2dData, resources: ComputationReso
         name='Change areas by LULC change type (ha)',
         filename='area_plot',
         summary='Change areas by LULC change type (ha) in the analysis period.',
-        description=(PROJECT_DIR / 'resources/artifact_descriptions/07_area_plot.md').read_text(encoding='utf-8'),
+        description=read_artifact_description('07_area_plot.md'),
         tags={Topics.CHARTS},
     )
     area_data_artifact = create_chart_artifact(
@@ -154,7 +152,7 @@ def create_emission_plot_artifact(emission_data: Chart2dData, resources: Computa
         name='Carbon flows by LULC change type (tonnes)',
         filename='emission_plot',
         summary='Carbon flows by LULC change type (tonnes) in the analysis period.',
-        description=(PROJECT_DIR / 'resources/artifact_descriptions/06_emission_plot.md').read_text(encoding='utf-8'),
+        description=read_artifact_description('06_emission_plot.md'),
         tags={Topics.CHARTS},
     )
     emission_data_artifact = create_chart_artifact(
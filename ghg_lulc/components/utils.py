@@ -1,5 +1,6 @@
 import logging
 from enum import Enum, StrEnum
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict
 
@@ -15,7 +16,6 @@ from matplotlib.colors import TwoSlopeNorm, to_hex
 from pydantic_extra_types.color import Color
 from rasterio.features import geometry_mask
 from shapely import Polygon
-from shapely.ops import transform
 
 log = logging.getLogger(__name__)
 
@@ -85,6 +85,17 @@ class Topics(StrEnum):
     TABLES = 'tables'
 
 
+@lru_cache
+def read_artifact_description(file_name: str) -> str:
+    """
+    Read an artifact description from the resources.
+
+    :param file_name: Name of the markdown file in the artifact description directory
+    :return: Content of the description file
+    """
+    return (PROJECT_DIR / 'resources/artifact_descriptions' / file_name).read_text(encoding='utf-8')
+
+
 def get_ghg_stock(utility_labels: Dict[str, LabelDescriptor]) -> Dict[GhgStockSource, pd.DataFrame]:
     """
     Get GHG stocks from each GHG stock source.
@@ -157,6 +168,20 @@ def calc_emission_factors(ghg_stock: Dict[GhgStockSource, pd.DataFrame]) -> Dict
     return emission_factors
 
 
+def get_change_labels(change_df: pd.DataFrame) -> pd.Series:
+    """
+    Label each LULC change type with its class names, e.g. 'forest to grass'.
+
+    :param change_df: DataFrame with the LULC class names before and after the change
+    :return: Column of change type labels
+    """
+    return (
+        change_df['utility_class_name_before']
+        .astype(str)
+        .str.cat(change_df['utility_class_name_after'].astype(str), sep=' to ')
+    )
+
+
 def fetch_lulc(lulc_utility: LulcUtility, lulc_area: LulcWorkUnit, aoi: shapely.MultiPolygon) -> RasterInfo:
     """
     Get LULC classification for a certain timestamp.
@@ -220,7 +245,10 @@ def get_colors(values: pd.Series) -> pd.Series:
     max_val = values.max()
     abs_max_val = max(abs(min_val), abs(max_val))
     norm = TwoSlopeNorm(vmin=-abs_max_val, vcenter=0, vmax=abs_max_val)
-    color_col = values.apply(lambda x: pyplot_to_pydantic_color(cmap(norm(x))))
+    rgba_colors = cmap(norm(values.to_numpy()))
+    color_col = pd.Series(
+        [pyplot_to_pydantic_color(rgba) for rgba in rgba_colors], index=values.index, name=values.name, dtype=object
+    )
 
     return color_col
 
@@ -238,7 +266,10 @@ def reproject_aoi(aoi: shapely.MultiPolygon, source_crs='EPSG:4326', target_crs=
     :param target_crs: provided as string: defaults to EPSG:32632
     """
 
-    project = pyproj.Transformer.from_crs(pyproj.CRS(source_crs), pyproj.CRS(target_crs), always_xy=True).transform
+    transformer = pyproj.Transformer.from_crs(pyproj.CRS(source_crs), pyproj.CRS(target_crs), always_xy=True)
 
-    aoi_reprojected = transform(project, aoi)
+    # transform all vertices in one call instead of calling back into Python per coordinate
+    aoi_reprojected = shapely.transform(
+        aoi, lambda coords: np.column_stack(transformer.transform(coords[:, 0], coords[:, 1]))
+    )
     return aoi_reprojected
@@ -4,19 +4,21 @@ from pydantic import BaseModel, Field, conint, model_validator
 
 from ghg_lulc.components.utils import GhgStockSource
 
+CURRENT_YEAR = datetime.now().year
+
 
 class ComputeInput(BaseModel):
-    start_year: conint(ge=2017, le=datetime.now().year - 2) = Field(
+    start_year: conint(ge=2017, le=CURRENT_YEAR - 2) = Field(
         title='Start',
-        description=f'First year of the period of analysis. Must be between 2017 and {datetime.now().year - 2}. '
+        description=f'First year of the period of analysis. Must be between 2017 and {CURRENT_YEAR - 2}. '
         f'Satellite images from the month July of the selected year are used for LULC classification.',
         examples=[2017],
     )
-    end_year: conint(ge=2018, le=datetime.now().year - 1) = Field(
+    end_year: conint(ge=2018, le=CURRENT_YEAR - 1) = Field(
         title='End',
-        description=f'Last year of the period of analysis. Must be between 2018 and {datetime.now().year - 1}. '
+        description=f'Last year of the period of analysis. Must be between 2018 and {CURRENT_YEAR - 1}. '
         f'Satellite images from the month July of the selected year are used for LULC classification.',
-        examples=[datetime.now().year - 1],
+        examples=[CURRENT_YEAR - 1],
     )
     carbon_stock_source: GhgStockSource = Field(
         title='Source of LULC carbon stock values',
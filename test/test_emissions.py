@@ -122,7 +122,7 @@ def test_masked_change_info(default_calculator):
 
 def test_get_change_emissions_info(default_calculator):
     change = RasterInfo(
-        data=ma.masked_array([[0, 2, -1]], mask=[[0, 0, 0]]),
+        data=ma.masked_array([[0, 2, 255]], mask=[[0, 0, 0]], dtype=np.uint8),
         crs=CRS.from_epsg(4326),
         transformation=Affine.identity(),
     )
@@ -130,27 +130,40 @@ def test_get_change_emissions_info(default_calculator):
     expected_output_array = ma.masked_array(
         [[0, 0.915, -999.999]],
         mask=[[0, 0, 0]],
+        dtype=np.float32,
     )
 
     change_emissions = default_calculator.get_change_emissions_info(change)
 
+    assert change_emissions.data.dtype == np.float32
     np.testing.assert_array_equal(change_emissions.data, expected_output_array)
 
 
 def test_get_masked_change_emissions_info(default_calculator):
     change = RasterInfo(
-        data=ma.masked_array([[0, 2, -1]], mask=[[0, 1, 0]]),
+        data=ma.masked_array([[0, 2, 255]], mask=[[0, 1, 0]], dtype=np.uint8),
         crs=CRS.from_epsg(4326),
         transformation=Affine.identity(),
     )
 
-    expected_output_array = ma.masked_array([[0, 0.915, -999.999]], mask=[[0, 1, 0]])
+    expected_output_array = ma.masked_array([[0, 0.915, -999.999]], mask=[[0, 1, 0]], dtype=np.float32)
 
     change_emissions = default_calculator.get_change_emissions_info(change)
 
     np.testing.assert_array_equal(change_emissions.data, expected_output_array)
 
 
+def test_get_change_emissions_info_rejects_non_uint8_changes(default_calculator):
+    change = RasterInfo(
+        data=ma.masked_array([[0, 2, 256]], mask=[[0, 0, 0]], dtype=np.int16),
+        crs=CRS.from_epsg(4326),
+        transformation=Affine.identity(),
+    )
+
+    with pytest.raises(TypeError):
+        default_calculator.get_change_emissions_info(change)
+
+
 def test_convert_change_raster(default_calculator):
     changes = RasterInfo(
         data=ma.masked_array(
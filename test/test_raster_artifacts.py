@@ -0,0 +1,167 @@
+import numpy as np
+import pytest
+import rasterio
+from affine import Affine
+from climatoology.base.artifact import RasterInfo
+from climatoology.utility.lulc import LabelDescriptor
+from numpy import ma
+from rasterio import CRS
+
+from ghg_lulc.components.raster_artifacts import (
+    code_dtype,
+    create_classification_artifacts,
+    dense_codes,
+    legend_color,
+    mask_no_data,
+    patch_change_data,
+    render_emission_description,
+)
+
+
+def test_dense_codes_integer():
+    values, codes = dense_codes(np.array([7, 3, 3, 255, 0], dtype=np.uint8))
+
+    np.testing.assert_array_equal(values, np.array([0, 3, 7, 255], dtype=np.uint8))
+    np.testing.assert_array_equal(codes, [2, 1, 1, 3, 0])
+
+
+def test_dense_codes_float():
+    values, codes = dense_codes(np.array([0.915, -999.999, 0.0, 0.915]))
+
+    np.testing.assert_array_equal(values, [-999.999, 0.0, 0.915])
+    np.testing.assert_array_equal(codes, [2, 0, 1, 2])
+
+
+def test_patch_change_data():
+    change_data = ma.masked_array([[0.0, 0.915, -999.999], [0.915, 5.0, 0.0]], mask=[[0, 0, 0], [0, 1, 0]])
+    colormap = {0.0: (128, 128, 128), 0.915: (244, 152, 122)}
+
+    patched_data, patched_colormap = patch_change_data(change_data, colormap)
+
+    expected_data = ma.masked_array([[1, 2, 0], [2, 0, 1]], mask=[[0, 0, 0], [0, 1, 0]])
+    assert ma.allequal(patched_data, expected_data)
+    np.testing.assert_array_equal(patched_data.mask, expected_data.mask)
+    assert patched_data.dtype == np.uint8
+    assert patched_data.fill_value == 255
+    assert patched_colormap == {0: (0, 0, 0), 1: (128, 128, 128), 2: (244, 152, 122)}
+
+
+def test_patch_change_data_from_classes():
+    class_data = ma.masked_array([[0, 2, 255], [2, 7, 0]], mask=[[0, 0, 0], [0, 1, 0]], dtype=np.uint8)
+    change_data = ma.masked_array([[0.0, 0.915, -999.999], [0.915, 0.535, 0.0]], mask=[[0, 0, 0], [0, 1, 0]])
+    colormap = {0.0: (128, 128, 128), 0.915: (244, 152, 122)}
+
+    patched_data, patched_colormap = patch_change_data(change_data, colormap, class_data=class_data)
+
+    expected_data = ma.masked_array([[1, 2, 0], [2, 0, 1]], mask=[[0, 0, 0], [0, 1, 0]])
+    assert ma.allequal(patched_data, expected_data)
+    np.testing.assert_array_equal(patched_data.mask, expected_data.mask)
+    assert patched_colormap == {0: (0, 0, 0), 1: (128, 128, 128), 2: (244, 152, 122)}
+
+
+def test_mask_no_data():
+    data = ma.masked_array([[1, 255, 3], [255, 5, 6]], mask=[[0, 0, 1], [0, 0, 0]], dtype=np.uint8)
+
+    masked_data = mask_no_data(data)
+
+    np.testing.assert_array_equal(masked_data.mask, [[0, 1, 1], [1, 0, 0]])
+    assert masked_data.fill_value == 255
+    assert np.shares_memory(masked_data.data, data.data)
+
+
+def test_render_emission_description():
+    description = render_emission_description(
+        carbon_stocks=(('forest', 253), ('grass', 161.5)),
+        emission_factors=(('forest', 'grass', 91.5),),
+    )
+
+    assert '{carbon_stocks}' not in description
+    assert '{emission_factors}' not in description
+    assert '253.0' in description
+    assert '91.5' in description
+
+
+def test_patch_change_data_many_values():
+    change_data = ma.masked_array(np.arange(300, dtype=np.float32) / 10, mask=np.zeros(300))
+
+    patched_data, patched_colormap = patch_change_data(change_data, {})
+
+    assert patched_data.dtype == np.uint16
+    np.testing.assert_array_equal(patched_data, np.arange(300))
+    assert len(patched_colormap) == 300
+
+
+def test_patch_change_data_dense():
+    change_data = ma.masked_array([[0, 1], [2, 1]], mask=[[0, 0], [0, 1]], dtype=np.uint8)
+    colormap = {0: (0, 0, 0), 2: (255, 255, 255)}
+
+    patched_data, patched_colormap = patch_change_data(change_data, colormap)
+
+    assert np.shares_memory(patched_data.data, change_data.data)
+    np.testing.assert_array_equal(patched_data.mask, change_data.mask)
+    assert patched_colormap == {0: (0, 0, 0), 1: (0, 0, 0), 2: (255, 255, 255)}
+
+
+def test_legend_color():
+    color = legend_color((128, 128, 128))
+
+    assert color.as_rgb_tuple() == (128, 128, 128)
+    assert legend_color((128, 128, 128)) is color
+
+
+def test_code_dtype():
+    assert code_dtype(255) == np.uint8
+    assert code_dtype(256) == np.uint16
+    assert code_dtype(65535) == np.uint16
+    with pytest.raises(ValueError):
+        code_dtype(65536)
+
+
+@pytest.mark.parametrize('n_values', [255, 256, 300])
+def test_patch_change_data_reserves_no_data_value(n_values):
+    change_data = ma.masked_array(np.arange(n_values, dtype=np.float32) / 10, mask=np.zeros(n_values))
+
+    patched_data, patched_colormap = patch_change_data(change_data, {})
+
+    assert patched_data.fill_value not in range(len(patched_colormap))
+    assert patched_data.fill_value == np.iinfo(patched_data.dtype).max
+
+
+def test_create_classification_artifacts(compute_resources):
+    labels = {
+        'forest': LabelDescriptor(
+            name='forest',
+            description='A forest',
+            osm_filter='landuse=forest',
+            raster_value=1,
+            color=(0, 255, 0),
+        ),
+        'grass': LabelDescriptor(
+            name='grass',
+            description='A grass patch',
+            osm_filter='landuse=grass',
+            raster_value=2,
+            color=(255, 255, 0),
+        ),
+    }
+    before_data = np.tile(np.array([1, 2], dtype=np.uint8), (64, 32))
+    after_data = before_data[:, ::-1].copy()
+    lulc_before, lulc_after = (
+        RasterInfo(
+            data=ma.masked_array(data, mask=np.zeros(data.shape)),
+            crs=CRS.from_epsg(4326),
+            transformation=Affine.identity(),
+            colormap={0: (0, 0, 0), 1: (0, 255, 0), 2: (255, 255, 0)},
+        )
+        for data in (before_data, after_data)
+    )
+
+    create_classification_artifacts(lulc_before, lulc_after, labels, compute_resources)
+
+    for filename, expected_data in (
+        ('lulc_classification_before', before_data),
+        ('lulc_classification_after', after_data),
+    ):
+        (file_path,) = compute_resources.computation_dir.glob(f'{filename}.*')
+        with rasterio.open(file_path) as raster:
+            np.testing.assert_array_equal(raster.read(1), expected_data)
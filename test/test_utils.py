@@ -5,7 +5,15 @@ from numpy import ma
 from pydantic_extra_types.color import Color
 from shapely import Polygon
 
-from ghg_lulc.components.utils import GhgStockSource, calc_emission_factors, get_colors, get_ghg_stock, mask_raster
+from ghg_lulc.components.utils import (
+    GhgStockSource,
+    calc_emission_factors,
+    get_change_labels,
+    get_colors,
+    get_ghg_stock,
+    mask_raster,
+    read_artifact_description,
+)
 
 
 def test_get_ghg_stock(lulc_utility_mock):
@@ -56,3 +64,20 @@ def test_get_colors():
     expected_input = pd.Series([1.0, 0.5, 0.0])
     computed_output = get_colors(expected_input)
     pd.testing.assert_series_equal(computed_output, expected_output)
+
+
+def test_read_artifact_description():
+    description = read_artifact_description('03_LULC_change.md')
+
+    assert description
+    assert read_artifact_description('03_LULC_change.md') is description
+
+
+def test_get_change_labels():
+    change_df = pd.DataFrame(
+        {'utility_class_name_before': ['forest', 'grass'], 'utility_class_name_after': ['grass', 'built-up']}
+    )
+
+    labels = get_change_labels(change_df)
+
+    assert labels.to_list() == ['forest to grass', 'grass to built-up']